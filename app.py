@@ -1,6 +1,10 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, Response
+from waitress import serve
+import orjson
 import psutil
 import os
+import threading
+import time
 from datetime import datetime
 from deadlock_detector import DeadlockDetector
 from process_monitor import ProcessMonitor
@@ -8,11 +12,54 @@ from recovery_module import RecoveryModule
 
 app = Flask(__name__)
 
+def _json(obj, status=200):
+    """JSON response encoded with orjson (C serializer, faster than jsonify)"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
 # Initialize modules
 deadlock_detector = DeadlockDetector()
 process_monitor = ProcessMonitor()
 recovery_module = RecoveryModule()
 
+# Guards deadlock_detector: mutators hold it for the whole update, readers only
+# while taking a snapshot, so JSON serialization happens outside the lock
+detector_lock = threading.RLock()
+
+# (graph_version, encoded body) of the last /api/manual/get_state response
+_state_cache = (None, None)
+
+# System stats are sampled by a background thread every STATS_SAMPLE_INTERVAL seconds
+STATS_SAMPLE_INTERVAL = 1.0
+
+def _sample_system_stats(interval=None):
+    """
+    Take one system statistics sample
+    With interval=None CPU is measured since the previous sample (non-blocking)
+    """
+    return {
+        'cpu_percent': psutil.cpu_percent(interval=interval),
+        'memory_percent': psutil.virtual_memory().percent,
+        'process_count': len(psutil.pids()),
+        'timestamp': datetime.now().isoformat()
+    }
+
+# Latest sample; rebinding the name is atomic, so readers never see a partial dict.
+# The startup sample blocks for 0.1 s once so it has a real CPU window; it also
+# sets the baseline for the sampler's non-blocking reads
+_latest_stats = _sample_system_stats(interval=0.1)
+
+def _stats_sampler():
+    """Refresh _latest_stats forever, independent of how often clients poll"""
+    global _latest_stats
+    while True:
+        time.sleep(STATS_SAMPLE_INTERVAL)
+        try:
+            _latest_stats = _sample_system_stats()
+        except Exception:
+            continue  # Keep serving the previous sample
+
+threading.Thread(target=_stats_sampler, name='stats-sampler', daemon=True).start()
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -24,8 +71,9 @@ def add_process():
     process_id = data.get('process_id')
     process_name = data.get('process_name')
     
-    deadlock_detector.add_process(process_id, process_name)
-    return jsonify({'status': 'success', 'message': f'Process {process_name} added'})
+    with detector_lock:
+        deadlock_detector.add_process(process_id, process_name)
+    return _json({'status': 'success', 'message': f'Process {process_name} added'})
 
 @app.route('/api/manual/add_resource', methods=['POST'])
 def add_resource():
@@ -35,8 +83,9 @@ def add_resource():
     resource_name = data.get('resource_name')
     instances = data.get('instances', 1)
     
-    deadlock_detector.add_resource(resource_id, resource_name, instances)
-    return jsonify({'status': 'success', 'message': f'Resource {resource_name} added'})
+    with detector_lock:
+        deadlock_detector.add_resource(resource_id, resource_name, instances)
+    return _json({'status': 'success', 'message': f'Resource {resource_name} added'})
 
 @app.route('/api/manual/allocate', methods=['POST'])
 def allocate_resource():
@@ -45,8 +94,9 @@ def allocate_resource():
     process_id = data.get('process_id')
     resource_id = data.get('resource_id')
     
-    deadlock_detector.allocate_resource(process_id, resource_id)
-    return jsonify({'status': 'success'})
+    with detector_lock:
+        deadlock_detector.allocate_resource(process_id, resource_id)
+    return _json({'status': 'success'})
 
 @app.route('/api/manual/request', methods=['POST'])
 def request_resource():
@@ -55,15 +105,16 @@ def request_resource():
     process_id = data.get('process_id')
     resource_id = data.get('resource_id')
     
-    deadlock_detector.request_resource(process_id, resource_id)
-    return jsonify({'status': 'success'})
+    with detector_lock:
+        deadlock_detector.request_resource(process_id, resource_id)
+    return _json({'status': 'success'})
 
 @app.route('/api/manual/detect', methods=['GET'])
 def detect_deadlock_manual():
     """Detect deadlock in manual mode"""
-    result = deadlock_detector.detect_deadlock()
-    
-    if result['deadlock_detected']:
+    with detector_lock:
+        result = deadlock_detector.detect_deadlock()
+        
         # Get full process details for recovery options
         process_details = []
         for process_id in result['deadlock_processes']:
@@ -78,20 +129,23 @@ def detect_deadlock_manual():
                     'memory_percent': 0,
                     'num_threads': 1
                 })
-        
+    
+    if result['deadlock_detected']:
         recovery_options = recovery_module.generate_recovery_options(
             result['deadlock_cycle'],
             process_details
         )
         result['recovery_options'] = recovery_options
     
-    return jsonify(result)
+    return _json(result)
 
 @app.route('/api/manual/predict', methods=['GET'])
 def predict_deadlock_manual():
     """Predict if system is in safe state"""
-    result = deadlock_detector.predict_deadlock()
-    return jsonify(result)
+    with detector_lock:
+        result = deadlock_detector.predict_deadlock()
+        # details holds the live Banker matrices, so serialize before releasing
+        return _json(result)
 
 @app.route('/api/manual/predict_allocation', methods=['POST'])
 def predict_allocation_manual():
@@ -100,29 +154,40 @@ def predict_allocation_manual():
     process_id = data.get('process_id')
     resource_id = data.get('resource_id')
     
-    result = deadlock_detector.predict_allocation(process_id, resource_id)
-    return jsonify(result)
+    with detector_lock:
+        result = deadlock_detector.predict_allocation(process_id, resource_id)
+    return _json(result)
 
 @app.route('/api/manual/get_state', methods=['GET'])
 def get_manual_state():
     """Get current state of manual simulation"""
-    return jsonify({
-        'processes': deadlock_detector.get_processes(),
-        'resources': deadlock_detector.get_resources(),
-        'graph': deadlock_detector.get_graph_data()
-    })
+    global _state_cache
+    
+    # Snapshot under the lock, serialize outside it
+    with detector_lock:
+        version = deadlock_detector.graph_version
+        cached_version, cached_body = _state_cache
+        if cached_version == version:
+            return Response(cached_body, mimetype='application/json')
+        
+        snapshot = deadlock_detector.snapshot()
+    
+    body = orjson.dumps(snapshot)
+    _state_cache = (version, body)
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/manual/reset', methods=['POST'])
 def reset_manual():
     """Reset manual simulation"""
-    deadlock_detector.reset()
-    return jsonify({'status': 'success', 'message': 'Simulation reset'})
+    with detector_lock:
+        deadlock_detector.reset()
+    return _json({'status': 'success', 'message': 'Simulation reset'})
 
 @app.route('/api/realtime/processes', methods=['GET'])
 def get_realtime_processes():
     """Get real-time Windows processes"""
     processes = process_monitor.get_processes()
-    return jsonify({'processes': processes})
+    return _json({'processes': processes})
 
 @app.route('/api/realtime/detect', methods=['GET'])
 def detect_deadlock_realtime():
@@ -136,7 +201,7 @@ def detect_deadlock_realtime():
         )
         result['recovery_options'] = recovery_options
     
-    return jsonify(result)
+    return _json(result)
 
 @app.route('/api/recovery/execute', methods=['POST'])
 def execute_recovery():
@@ -147,19 +212,23 @@ def execute_recovery():
     
     # Handle both string IDs (manual mode) and integer PIDs (real-time mode)
     # Pass deadlock_detector for manual mode to actually update the system
-    result = recovery_module.execute_action(action, process_id, deadlock_detector)
-    return jsonify(result)
+    if recovery_module.is_manual_process(process_id):
+        with detector_lock:
+            result = recovery_module.execute_action(action, process_id, deadlock_detector)
+    else:
+        # Real OS process: terminate() may wait up to 5 s, keep manual mode unblocked
+        result = recovery_module.execute_action(action, process_id, deadlock_detector)
+    return _json(result)
 
 @app.route('/api/system/stats', methods=['GET'])
 def get_system_stats():
     """Get system statistics"""
-    stats = {
-        'cpu_percent': psutil.cpu_percent(interval=1),
-        'memory_percent': psutil.virtual_memory().percent,
-        'process_count': len(psutil.pids()),
-        'timestamp': datetime.now().isoformat()
-    }
-    return jsonify(stats)
+    return _json(_latest_stats)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if os.environ.get('FLASK_DEBUG') == '1':
+        # Development: interactive debugger and auto-reloader
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        # Production WSGI server with a thread pool for concurrent polling
+        serve(app, host='0.0.0.0', port=5000, threads=8)
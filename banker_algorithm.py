@@ -54,40 +54,41 @@ class BankerAlgorithm:
         """
         # Make copies for simulation
         work = self.available.copy()
-        finish = {proc_id: False for proc_id in self.processes}
+        pending = list(self.processes)  # Processes that have not finished yet, in order
         safe_sequence = []
         
-        # Try to find safe sequence
-        iterations = 0
-        max_iterations = len(self.processes) * 2
-        
-        while len(safe_sequence) < len(self.processes) and iterations < max_iterations:
-            iterations += 1
-            found = False
-            
-            for proc_id in self.processes:
-                if finish[proc_id]:
-                    continue
-                
-                # Check if process can finish with available resources
-                can_finish = True
-                for res_id in self.resources:
-                    if self.need[proc_id][res_id] > work.get(res_id, 0):
-                        can_finish = False
-                        break
+        if not any(any(self.allocation[proc_id].values()) for proc_id in pending):
+            # Nothing is held, so finishing a process never grows work:
+            # a single pass decides every process, in order
+            safe_sequence = [
+                proc_id for proc_id in pending
+                if all(self.need[proc_id][res_id] <= work.get(res_id, 0) for res_id in self.resources)
+            ]
+        else:
+            # Try to find safe sequence; stops as soon as no process is pending
+            while pending:
+                found = False
                 
-                if can_finish:
-                    # Process can finish, release its resources
+                for idx, proc_id in enumerate(pending):
+                    # Check if process can finish with available resources
+                    can_finish = True
                     for res_id in self.resources:
-                        work[res_id] = work.get(res_id, 0) + self.allocation[proc_id][res_id]
+                        if self.need[proc_id][res_id] > work.get(res_id, 0):
+                            can_finish = False
+                            break
                     
-                    finish[proc_id] = True
-                    safe_sequence.append(proc_id)
-                    found = True
+                    if can_finish:
+                        # Process can finish, release its resources
+                        for res_id in self.resources:
+                            work[res_id] = work.get(res_id, 0) + self.allocation[proc_id][res_id]
+                        
+                        del pending[idx]
+                        safe_sequence.append(proc_id)
+                        found = True
+                        break
+                
+                if not found:
                     break
-            
-            if not found:
-                break
         
         is_safe = len(safe_sequence) == len(self.processes)
         
@@ -152,11 +153,14 @@ class BankerAlgorithm:
         if process_id not in self.processes:
             return 0
         
+        return self._risk_score(process_id, len(self.resources) * 2, sum(self.available.values()))
+    
+    def _risk_score(self, process_id, max_possible, total_available):
+        """Risk score with system-wide totals precomputed by the caller"""
         risk = 0
         
         # Factor 1: How many resources allocated (30 points)
         total_allocated = sum(self.allocation[process_id].values())
-        max_possible = len(self.resources) * 2
         risk += (total_allocated / max(max_possible, 1)) * 30
         
         # Factor 2: How much more does it need (40 points)
@@ -164,7 +168,6 @@ class BankerAlgorithm:
         risk += (total_need / max(max_possible, 1)) * 40
         
         # Factor 3: Resource availability (30 points)
-        total_available = sum(self.available.values())
         if total_available < total_need:
             risk += 30
         else:
@@ -176,10 +179,12 @@ class BankerAlgorithm:
         """Get complete system state for visualization"""
         is_safe, safe_sequence, details = self.check_safe_state()
         
-        # Calculate risk scores for all processes
+        # Calculate risk scores for all processes, system-wide totals computed once
+        max_possible = len(self.resources) * 2
+        total_available = sum(self.available.values())
         risk_scores = {}
         for proc_id in self.processes:
-            risk_scores[proc_id] = self.calculate_risk_score(proc_id)
+            risk_scores[proc_id] = self._risk_score(proc_id, max_possible, total_available)
         
         return {
             'is_safe': is_safe,
@@ -1,5 +1,9 @@
+from itertools import chain
 from banker_algorithm import BankerAlgorithm
 
+# DFS node colors
+WHITE, GRAY, BLACK = 0, 1, 2
+
 class DeadlockDetector:
     """
     Deadlock detection algorithms implement karta hai:
@@ -11,9 +15,16 @@ class DeadlockDetector:
         self.processes = {}  # {process_id: {name, allocated, requested}} — process ka data
         self.resources = {}  # {resource_id: {name, instances, available}} — resource ka data
         self.allocation = {}  # {process_id: [resource_ids]} — allocation mapping
-        self.request = {}     # {process_id: [resource_ids]} — request mapping
+        self.request = {}     # {process_id: {resource_ids}} — request mapping (set, O(1) membership)
+        self.holders = {}     # {resource_id: {process_id: count}} — allocation ka reverse mapping
         self.edges = []       # [(from, to, type)] — graph visualization ke liye edges
+        self.adjacency = {}   # {node: outgoing neighbors} — request/holders ke hi objects, alag copy nahi
         self.banker = BankerAlgorithm()  # Banker's Algorithm prediction ke liye
+        self.graph_version = 0  # Har mutation par badhta hai, caches isse invalidate hote hain
+        self._completed = set()  # Cycle-free proven nodes (current graph_version ke liye)
+        self._completed_version = 0
+        self._acyclic_version = 0  # Jis graph_version par graph cycle-free confirm hua
+        self._prediction = (None, None)  # (graph_version, predict_deadlock result)
     
     def reset(self):
         """Sab data structures ko reset karo"""
@@ -21,7 +32,11 @@ class DeadlockDetector:
         self.resources = {}
         self.allocation = {}
         self.request = {}
+        self.holders = {}
         self.edges = []
+        self.adjacency = {}
+        self.graph_version += 1
+        self._acyclic_version = self.graph_version  # Khaali graph me cycle nahi ho sakti
     
     def add_process(self, process_id, process_name):
         """Naya process add karo"""
@@ -31,8 +46,16 @@ class DeadlockDetector:
             'allocated': [],
             'requested': []
         }
+        was_acyclic = self._acyclic_version == self.graph_version
+        # Same id dobara add ho toh purane allocations holders se hata do
+        for resource_id in self.allocation.get(process_id, []):
+            self._release_holder(resource_id, process_id)
         self.allocation[process_id] = []
-        self.request[process_id] = []
+        self.request[process_id] = set()
+        self.adjacency[process_id] = self.request[process_id]  # Process -> requested resources
+        self.graph_version += 1
+        if was_acyclic:
+            self._acyclic_version = self.graph_version
         
         # Update Banker's Algorithm
         if len(self.resources) > 0:
@@ -47,6 +70,11 @@ class DeadlockDetector:
             'instances': instances,
             'available': instances
         }
+        was_acyclic = self._acyclic_version == self.graph_version
+        self.adjacency[resource_id] = self.holders.setdefault(resource_id, {})  # Resource -> holders
+        self.graph_version += 1
+        if was_acyclic:
+            self._acyclic_version = self.graph_version
         
         # Update Banker's Algorithm
         if len(self.processes) > 0:
@@ -59,7 +87,10 @@ class DeadlockDetector:
             return False
         
         if self.resources[resource_id]['available'] > 0:
+            was_acyclic = self._acyclic_version == self.graph_version
             self.allocation[process_id].append(resource_id)
+            held = self.holders[resource_id]
+            held[process_id] = held.get(process_id, 0) + 1
             self.processes[process_id]['allocated'].append(resource_id)
             self.resources[resource_id]['available'] -= 1
             
@@ -68,6 +99,11 @@ class DeadlockDetector:
             
             # Edge add karo: Resource -> Process (allocation)
             self.edges.append((resource_id, process_id, 'allocation'))
+            self.graph_version += 1
+            
+            # Naya edge R -> P tabhi cycle banata hai jab P se R tak pahuncha ja sake
+            if was_acyclic and resource_id not in self._reachable_from(process_id):
+                self._acyclic_version = self.graph_version
             return True
         return False
     
@@ -76,77 +112,109 @@ class DeadlockDetector:
         if process_id not in self.processes or resource_id not in self.resources:
             return False
         
-        self.request[process_id].append(resource_id)
+        # Same request dobara aaye toh graph me duplicate edge mat banao
+        if resource_id in self.request[process_id]:
+            return True
+        
+        was_acyclic = self._acyclic_version == self.graph_version
+        self.request[process_id].add(resource_id)
         self.processes[process_id]['requested'].append(resource_id)
         
         # Edge add karo: Process -> Resource (request)
         self.edges.append((process_id, resource_id, 'request'))
+        self.graph_version += 1
+        
+        # Naya edge P -> R tabhi cycle banata hai jab R se P tak pahuncha ja sake
+        if was_acyclic and process_id not in self._reachable_from(resource_id):
+            self._acyclic_version = self.graph_version
         return True
     
+    def _release_holder(self, resource_id, process_id):
+        """Holders index se ek instance hatao — O(1), list scan nahi"""
+        held = self.holders[resource_id]
+        if held[process_id] > 1:
+            held[process_id] -= 1
+        else:
+            del held[process_id]
+    
+    def _reachable_from(self, node):
+        """
+        Node se jitne nodes tak pahuncha ja sakta hai unka set do
+        (Process -> requested resources, Resource -> holder processes)
+        """
+        visited = {node}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for neighbor in self.adjacency.get(current, ()):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        return visited
+    
     def detect_deadlock(self):
         """
         RAG me cycle detect karke deadlock detect karo
         DFS use karke graph me cycles dhundo
         """
-        # Build adjacency list for the graph
-        graph = {}
-        all_nodes = set(self.processes.keys()) | set(self.resources.keys())
-        
-        for node in all_nodes:
-            graph[node] = []
+        # Incremental checks ne graph ko cycle-free confirm kar diya hai toh full scan skip karo
+        if self._acyclic_version == self.graph_version:
+            return self._no_deadlock_result()
         
-        # Graph build kar rahe hain:
+        # Graph ki copy nahi banate — DFS seedha live adjacency par chalta hai:
         # 1. Process -> Resource (request edge): Process resource ka wait kar raha hai
         # 2. Resource -> Process (allocation edge): Resource kisi process ke paas hai
-        for process_id in self.processes:
-            # Request edges: Process -> Resource
-            for resource_id in self.request[process_id]:
-                graph[process_id].append(resource_id)
-            
-            # Allocation edges: Resource -> Process (reverse direction)
-            for resource_id in self.allocation[process_id]:
-                graph[resource_id].append(process_id)
+        # Pichhle scan me jo nodes cycle-free prove ho chuke hain (BLACK),
+        # woh graph badalne tak dobara walk nahi honge
+        if self._completed_version != self.graph_version:
+            self._completed = set()
+            self._completed_version = self.graph_version
+        completed = self._completed
         
-        # DFS se cycle detect karne ka function
-        def has_cycle_dfs(node, visited, rec_stack, path):
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
+        # Iterative DFS: WHITE = unvisited, GRAY = current stack par, BLACK = done
+        state = {}
+        for start in chain(self.processes, self.resources):
+            if start in completed or state.get(start, WHITE) != WHITE:
+                continue
             
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    result = has_cycle_dfs(neighbor, visited, rec_stack, path)
-                    if result:  # Agar cycle mil gayi toh upar propagate karo
-                        return result
-                elif neighbor in rec_stack:
-                    # Cycle detect hui! Cycle nikal lo
-                    cycle_start_idx = path.index(neighbor)
-                    cycle = path[cycle_start_idx:] + [neighbor]
-                    return cycle
-            
-            path.pop()
-            rec_stack.remove(node)
-            return None
-        
-        # Sab nodes ko check karo cycles ke liye
-        visited = set()
-        for node in all_nodes:
-            if node not in visited:
-                rec_stack = set()
-                path = []
-                cycle = has_cycle_dfs(node, visited, rec_stack, path)
-                if cycle:
-                    # Deadlock me involved processes nikal lo
-                    deadlock_processes = [n for n in cycle if n in self.processes]
-                    cycle_str = ' → '.join([str(n) for n in cycle])
-                    
-                    return {
-                        'deadlock_detected': True,
-                        'deadlock_cycle': cycle,
-                        'deadlock_processes': deadlock_processes,
-                        'message': f'Deadlock detected! Cycle: {cycle_str}'
-                    }
+            state[start] = GRAY
+            stack = [(start, iter(self.adjacency.get(start, ())))]
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor in completed:
+                        continue
+                    color = state.get(neighbor, WHITE)
+                    if color == WHITE:
+                        state[neighbor] = GRAY
+                        stack.append((neighbor, iter(self.adjacency.get(neighbor, ()))))
+                        break
+                    if color == GRAY:
+                        # Cycle detect hui! Stack se cycle nikal lo
+                        path = [frame[0] for frame in stack]
+                        cycle = path[path.index(neighbor):] + [neighbor]
+                        
+                        # Deadlock me involved processes nikal lo
+                        deadlock_processes = [n for n in cycle if n in self.processes]
+                        cycle_str = ' → '.join([str(n) for n in cycle])
+                        
+                        return {
+                            'deadlock_detected': True,
+                            'deadlock_cycle': cycle,
+                            'deadlock_processes': deadlock_processes,
+                            'message': f'Deadlock detected! Cycle: {cycle_str}'
+                        }
+                else:
+                    # Saare neighbors explore ho gaye, node cycle ka part nahi hai
+                    stack.pop()
+                    state[node] = BLACK
+                    completed.add(node)
         
+        self._acyclic_version = self.graph_version
+        return self._no_deadlock_result()
+    
+    def _no_deadlock_result(self):
+        """No-deadlock wala result dict"""
         return {
             'deadlock_detected': False,
             'deadlock_cycle': [],
@@ -161,6 +229,7 @@ class DeadlockDetector:
             for resource_id in self.allocation.get(process_id, []):
                 if resource_id in self.resources:
                     self.resources[resource_id]['available'] += 1
+                    self._release_holder(resource_id, process_id)
             
             # Process se related edges hata do
             self.edges = [edge for edge in self.edges if edge[0] != process_id and edge[1] != process_id]
@@ -169,6 +238,13 @@ class DeadlockDetector:
             del self.processes[process_id]
             del self.allocation[process_id]
             del self.request[process_id]
+            del self.adjacency[process_id]
+            
+            # Edges hatane se nayi cycle nahi banti
+            was_acyclic = self._acyclic_version == self.graph_version
+            self.graph_version += 1
+            if was_acyclic:
+                self._acyclic_version = self.graph_version
             
             # Banker ko dobara initialize karo agar kuch processes/resources bache hain
             if len(self.processes) > 0 and len(self.resources) > 0:
@@ -182,6 +258,17 @@ class DeadlockDetector:
         Banker's Algorithm se predict karo ki system safe hai ya nahi
         Returns prediction analysis
         """
+        # Graph nahi badla toh pichhla analysis hi valid hai
+        version, cached = self._prediction
+        if version == self.graph_version:
+            return cached
+        
+        result = self._predict_deadlock()
+        self._prediction = (self.graph_version, result)
+        return result
+    
+    def _predict_deadlock(self):
+        """Banker's Algorithm se fresh prediction analysis"""
         if len(self.processes) == 0 or len(self.resources) == 0:
             return {
                 'is_safe': True,
@@ -233,6 +320,20 @@ class DeadlockDetector:
         """Sab resources lo"""
         return list(self.resources.values())
     
+    def snapshot(self):
+        """
+        Current state ki read-only copy (processes, resources, graph)
+        Live data se kuch share nahi hota, isliye lock ke bahar bhi safely use ho sakti hai
+        """
+        return {
+            'processes': [
+                dict(process, allocated=list(process['allocated']), requested=list(process['requested']))
+                for process in self.processes.values()
+            ],
+            'resources': [dict(resource) for resource in self.resources.values()],
+            'graph': self.get_graph_data()
+        }
+    
     def get_graph_data(self):
         """Visualization ke liye graph data do"""
         nodes = []
@@ -1,5 +1,7 @@
 import psutil
 import os
+import threading
+import time
 from collections import defaultdict
 
 class ProcessMonitor:
@@ -19,8 +21,22 @@ class ProcessMonitor:
         'spoolsv.exe', 'searchindexer.exe'
     }
     
+    # Seconds a process snapshot is reused before walking the process table again
+    PROCESS_CACHE_TTL = 1.0
+    
     def __init__(self):
         self.monitored_processes = {}
+        self._cache_lock = threading.Lock()
+        self._processes_cache = {'t': 0.0, 'data': None}
+        self._type_cache = {}  # (pid, create_time) -> process type, fixed for a process's lifetime
+        
+        # Prime per-process CPU counters so later non-blocking reads return real deltas
+        # (psutil.process_iter keeps its Process objects, and their baselines, across calls)
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(interval=None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
     
     def is_system_process(self, process):
         """
@@ -58,14 +74,52 @@ class ProcessMonitor:
         except:
             return 'unknown'
     
+    def _process_type(self, process):
+        """
+        Cached is_system_process: name, username and exe lookups run once per process
+        (pid, create_time) identifies the process even if the pid is later reused
+        """
+        key = (process.pid, process.create_time())
+        process_type = self._type_cache.get(key)
+        if process_type is None:
+            process_type = self.is_system_process(process)
+            if process_type != 'unknown':
+                self._type_cache[key] = process_type
+        return process_type
+    
     def get_processes(self):
-        """Get all running processes with details"""
+        """
+        Get all running processes with details
+        Back-to-back polls within PROCESS_CACHE_TTL share one process table walk
+        """
+        with self._cache_lock:
+            now = time.monotonic()
+            cached = self._processes_cache
+            if cached['data'] is not None and now - cached['t'] < self.PROCESS_CACHE_TTL:
+                return cached['data']
+            
+            processes = self._collect_processes()
+            self._processes_cache = {'t': now, 'data': processes}
+            return processes
+    
+    def _cpu_readings(self):
+        """
+        pid -> cpu_percent from the latest process table walk
+        Every cpu_percent() call resets the shared Process baseline, so only
+        _collect_processes reads it; everyone else uses these values
+        """
+        return {p['pid']: p['cpu_percent'] for p in self.get_processes()}
+    
+    def _collect_processes(self):
+        """Walk the process table and build the process list"""
         processes = []
+        live_keys = set()
         
         for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'status', 'num_threads']):
             try:
                 pinfo = proc.info
-                process_type = self.is_system_process(proc)
+                process_type = self._process_type(proc)
+                live_keys.add((proc.pid, proc.create_time()))
                 
                 processes.append({
                     'pid': pinfo['pid'],
@@ -80,16 +134,20 @@ class ProcessMonitor:
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
         
+        # Drop classifications of processes that have exited
+        self._type_cache = {key: ptype for key, ptype in self._type_cache.items() if key in live_keys}
+        
         return processes
     
     def get_detailed_processes(self, pids):
         """Get detailed information for specific processes"""
         detailed = []
+        cpu_by_pid = self._cpu_readings()
         
         for pid in pids:
             try:
                 proc = psutil.Process(pid)
-                process_type = self.is_system_process(proc)
+                process_type = self._process_type(proc)
                 
                 # Get open files
                 try:
@@ -108,7 +166,7 @@ class ProcessMonitor:
                     'name': proc.name(),
                     'type': process_type,
                     'status': proc.status(),
-                    'cpu_percent': proc.cpu_percent(interval=0.1),
+                    'cpu_percent': cpu_by_pid.get(pid, 0.0),
                     'memory_percent': proc.memory_percent(),
                     'num_threads': proc.num_threads(),
                     'username': proc.username() if hasattr(proc, 'username') else 'N/A',
@@ -134,14 +192,15 @@ class ProcessMonitor:
         suspicious_processes = []
         
         # Find processes that are waiting or have multiple threads in wait state
-        for proc in psutil.process_iter(['pid', 'name', 'status', 'num_threads', 'cpu_percent']):
+        # Status and CPU come from the latest process table walk, which owns the
+        # CPU baselines; reading cpu_percent() again here would measure ~0 s
+        for pinfo in self.get_processes():
             try:
-                pinfo = proc.info
                 pid = pinfo['pid']
                 
                 # Check if process is waiting/sleeping with low CPU usage
                 if pinfo['status'] in ['waiting', 'sleeping', 'disk-sleep']:
-                    cpu = proc.cpu_percent(interval=0.1)
+                    cpu = pinfo['cpu_percent']
                     num_threads = pinfo.get('num_threads', 0)
                     
                     # Suspicious: waiting state + low CPU + multiple threads
@@ -157,7 +216,7 @@ class ProcessMonitor:
                 
                 # Track file locks
                 try:
-                    for f in proc.open_files():
+                    for f in psutil.Process(pid).open_files():
                         file_locks[f.path].append(pid)
                 except (psutil.AccessDenied, psutil.NoSuchProcess):
                     pass
@@ -154,6 +154,11 @@ class RecoveryModule:
             return cons
         return []
     
+    @staticmethod
+    def is_manual_process(process_id):
+        """Manual mode IDs are strings like 'P1' (or small ints); anything else is a real PID"""
+        return isinstance(process_id, str) or (isinstance(process_id, int) and process_id < 100)
+    
     def execute_action(self, action, process_id, deadlock_detector=None):
         """
         Execute recovery action
@@ -167,7 +172,7 @@ class RecoveryModule:
             Result dictionary with success status
         """
         # Check if it's a manual mode process (string ID like 'P1')
-        if isinstance(process_id, str) or (isinstance(process_id, int) and process_id < 100):
+        if self.is_manual_process(process_id):
             # Manual mode - simulate the action and update the system
             if deadlock_detector:
                 # Actually remove the process from the system